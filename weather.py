@@ -1,12 +1,93 @@
 import sys
+import time
 import requests
 import os
 from dotenv import load_dotenv
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal
 
 load_dotenv()
 
+API_URL="https://api.openweathermap.org/data/2.5/weather"
+LATENCY_BUDGET=8 # seconds for a whole search before it is given up
+CONNECT_TIMEOUT=3.05
+
+class WeatherFetch(QThread):
+    loaded=pyqtSignal(dict)
+    failed=pyqtSignal(str)
+
+    def __init__(self,url):
+        super().__init__()
+        self.url=url
+
+    def run(self):
+        try:
+            # The read timeout applies to each socket read, not the whole response, so a slow trickle
+            # can keep this thread alive past the budget; the window stops waiting for it at the deadline
+            response=requests.get(self.url,timeout=(CONNECT_TIMEOUT,LATENCY_BUDGET))
+            response.raise_for_status()
+            data=response.json()
+            if data['cod']==200:
+                self.loaded.emit(data)
+            else:
+                self.failed.emit(data.get("message","Unknown Error"))
+
+        except requests.exceptions.HTTPError:
+            match response.status_code:
+                case 400:
+                    self.failed.emit("Bad request\nPLEase Check Your Input")
+                case 401:
+                    self.failed.emit("Unauthorized\nCheck Your API Key")
+                case 403:
+                    self.failed.emit("Forbidden\nCheck Your API Key")
+                case 404:
+                    self.failed.emit("Not Found\nCity Not Found")
+                case 500:
+                    self.failed.emit("Internal Server Error\nTry Again Later")
+                case 502:
+                    self.failed.emit("Bad Gateway\nTry Again Later")
+                case 503:
+                    self.failed.emit("Service Unavailable\nTry Again Later")
+                case 504:
+                    self.failed.emit("Gateway Timeout\nTry Again Later")
+                case _:
+                    self.failed.emit("Unknown Error")
+
+        except requests.exceptions.ConnectionError:
+            self.failed.emit("Connection Error\nCheck Your Internet Connection")
+        except requests.exceptions.Timeout:
+            self.failed.emit("Timeout Error\nTry Again Later")
+        except requests.exceptions.RequestException:
+            self.failed.emit("An Error Occurred\nPlease Try Again")
+        except requests.exceptions.TooManyRedirects:
+            self.failed.emit("Too Many Redirects\nPlease Try Again Later")
+        except Exception as e:
+            # e.g. a body without "cod"; without this the window would wait for the deadline with no reason given
+            self.failed.emit(f"An unexpected error occurred: {e}")
+
+
+class StallMeter(QObject):
+    # Measures how late a 10 ms heartbeat fires, i.e. how long the event loop was blocked
+    def __init__(self):
+        super().__init__()
+        self.samples=[]
+        self.last=time.perf_counter()
+        self.timer=QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+        self.timer.start(10)
+
+    def beat(self):
+        now=time.perf_counter()
+        self.samples.append(max(0.0,(now-self.last)*1000-10))
+        self.last=now
+
+    def report(self):
+        samples=sorted(self.samples) or [0.0]
+        print(f"event loop stalls: max {samples[-1]:.1f} ms, "
+              f"p99 {samples[int(len(samples)*0.99)-1]:.1f} ms over {len(samples)} beats")
+
+
 class WeatherApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -16,6 +97,11 @@ class WeatherApp(QWidget):
         self.temperature=QLabel(self)
         self.emoji_label=QLabel(self)
         self.description_label=QLabel(self)
+        self.search_id=0
+        self.fetches=set()
+        self.deadline=QTimer(self)
+        self.deadline.setSingleShot(True)
+        self.deadline.timeout.connect(self.on_deadline)
         self.initUI()
 
     def initUI(self):
@@ -78,48 +164,33 @@ class WeatherApp(QWidget):
     def get_weather(self):
         api_key=os.getenv("API_KEY")
         city=self.city_input.text()
-        url=f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}"
-        
-        try:
-            response=requests.get(url)
-            response.raise_for_status()
-            data=response.json()
-            if data['cod']==200:
-                self.display_weather(data)
-            
-        except requests.exceptions.HTTPError:
-            match response.status_code:
-                case 400:
-                    self.display_error("Bad request\nPLEase Check Your Input")
-                case 401:
-                    self.display_error("Unauthorized\nCheck Your API Key")
-                case 403:
-                    self.display_error("Forbidden\nCheck Your API Key")
-                case 404:
-                    self.display_error("Not Found\nCity Not Found")
-                case 500:
-                    self.display_error("Internal Server Error\nTry Again Later")
-                case 502:
-                    self.display_error("Bad Gateway\nTry Again Later")
-                case 503:
-                    self.display_error("Service Unavailable\nTry Again Later")
-                case 504:
-                    self.display_error("Gateway Timeout\nTry Again Later")
-                case _:
-                    self.display_error("Unknown Error")
-
-        except requests.exceptions.ConnectionError:
-            self.display_error("Connection Error\nCheck Your Internet Connection")
-        except requests.exceptions.Timeout:
-            self.display_error("Timeout Error\nTry Again Later")
-        except requests.exceptions.RequestException:
-            self.display_error("An Error Occurred\nPlease Try Again")
-        except requests.exceptions.TooManyRedirects:
-            self.display_error("Too Many Redirects\nPlease Try Again Later")  
-            
-                
-
-
+        url=f"{os.getenv('API_BASE_URL',API_URL)}?q={city}&appid={api_key}"
+
+        # A new search cancels the previous one: its result is dropped when it arrives
+        self.search_id+=1
+        search_id=self.search_id
+        fetch=WeatherFetch(url)
+        fetch.loaded.connect(lambda data: self.on_loaded(search_id,data))
+        fetch.failed.connect(lambda message: self.on_failed(search_id,message))
+        fetch.finished.connect(lambda: self.fetches.discard(fetch))
+        self.fetches.add(fetch) # keep running threads alive until they finish
+        fetch.start()
+        self.deadline.start(LATENCY_BUDGET*1000)
+
+    def on_loaded(self,search_id,data):
+        if search_id==self.search_id:
+            self.deadline.stop()
+            self.display_weather(data)
+
+    def on_failed(self,search_id,message):
+        if search_id==self.search_id:
+            self.deadline.stop()
+            self.display_error(message)
+
+    def on_deadline(self):
+        # Out of time budget: give up on the search still in flight
+        self.search_id+=1
+        self.display_error("Timeout Error\nTry Again Later")
 
     def display_error(self,message):
         self.temperature.setStyleSheet("font-size:35px;")
@@ -172,6 +243,9 @@ class WeatherApp(QWidget):
 
 if __name__=='__main__':
     app=QApplication(sys.argv)
+    if '--measure-stalls' in sys.argv:
+        stall_meter=StallMeter()
+        app.aboutToQuit.connect(stall_meter.report)
     weather_app=WeatherApp()
     weather_app.show()
     sys.exit(app.exec())
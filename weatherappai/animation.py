@@ -0,0 +1,230 @@
+import os
+import time
+from PyQt5.QtCore import QObject, QEvent, QTimer, QAbstractAnimation
+from PyQt5.QtGui import QMovie
+from PyQt5.QtWidgets import QApplication
+
+# Playback modes (ANIMATION_MODE in .env):
+#   normal    - full speed while visible and in use, capped when idle/inactive
+#   capped    - always limited to ANIMATION_FPS_CAP frames per second
+#   low_power - capped while in use, fully paused when idle/inactive
+MODES = ("normal", "capped", "low_power")
+
+# Effective playback states
+FULL = "full"
+CAPPED = "capped"
+PAUSED = "paused"
+
+INPUT_EVENTS = frozenset((QEvent.MouseMove, QEvent.MouseButtonPress, QEvent.KeyPress,
+                          QEvent.Wheel, QEvent.TouchBegin))
+
+
+class CpuMeter:
+    """Accumulates process CPU time and wall time per playback state."""
+
+    def __init__(self):
+        self.state = None
+        self.totals = {}
+        self._cpu = time.process_time()
+        self._wall = time.monotonic()
+
+    def start(self, state):
+        # Drop anything measured so far: the meter only covers time the window has been on screen
+        self.totals = {}
+        self._cpu, self._wall = time.process_time(), time.monotonic()
+        self.state = state
+
+    def switch(self, state):
+        self.flush()
+        self.state = state
+
+    def flush(self):
+        cpu, wall = time.process_time(), time.monotonic()
+        if self.state is not None:
+            spent = self.totals.setdefault(self.state, [0.0, 0.0])
+            spent[0] += cpu - self._cpu
+            spent[1] += wall - self._wall
+        self._cpu, self._wall = cpu, wall
+
+    def per_minute(self):
+        # CPU seconds burnt per minute of wall time spent in each state
+        self.flush()
+        return {state: (cpu / wall * 60 if wall else 0.0, wall)
+                for state, (cpu, wall) in self.totals.items()}
+
+    def format_report(self):
+        parts = [f"{state}: {cpu:.2f} cpu-s/min over {wall / 60:.1f} min"
+                 for state, (cpu, wall) in sorted(self.per_minute().items())]
+        return "[animation] " + (", ".join(parts) or "no samples")
+
+
+class AnimationController(QObject):
+    """Pauses or throttles movies and animations depending on window visibility and activity."""
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.mode = os.getenv("ANIMATION_MODE", "normal").strip().lower()
+        if self.mode not in MODES:
+            self.mode = "normal"
+        self.fps_cap = max(1, int(os.getenv("ANIMATION_FPS_CAP", "10")))
+        self.idle_seconds = max(1, int(os.getenv("ANIMATION_IDLE_SECONDS", "60")))
+
+        self.state = None
+        self.movies = []
+        self.animations = []
+        self.idle = False
+        self.exposed = True
+        self._last_input = time.monotonic()
+
+        # Manual frame stepping while capped, woken up for whichever movie is due next
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.step_frames)
+        self.frame_due = {} # movie -> monotonic time its next frame is due
+
+        # Periodic idle check (cheaper than restarting a timer on every mouse move)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(min(5, self.idle_seconds) * 1000)
+        self.idle_timer.timeout.connect(self.check_idle)
+        self.idle_timer.start()
+
+        # Metering starts once the window is first shown, so startup is not counted as playback
+        self.cpu = CpuMeter()
+        self.metering = False
+        if os.getenv("ANIMATION_CPU_REPORT", "0") == "1":
+            self.report_timer = QTimer(self)
+            self.report_timer.setInterval(60 * 1000)
+            self.report_timer.timeout.connect(self.print_report)
+            self.report_timer.start()
+            QApplication.instance().aboutToQuit.connect(self.print_report)
+
+        window.installEventFilter(self)
+        QApplication.instance().installEventFilter(self)
+        self.update_state()
+
+    # --- Registration ---
+
+    def start_movie(self, movie):
+        if movie not in self.movies:
+            self.movies.append(movie)
+        self.apply_to_movie(movie)
+
+    def stop_movie(self, movie):
+        if movie in self.movies:
+            self.movies.remove(movie)
+        movie.stop()
+        self.update_frame_timer()
+
+    def track_animation(self, animation):
+        self.animations = [a for a in self.animations if a.state() == QAbstractAnimation.Running]
+        self.animations.append(animation)
+        if self.state == PAUSED:
+            self.finish_animations()
+
+    def is_paused(self):
+        return self.state == PAUSED
+
+    # --- Events ---
+
+    def eventFilter(self, obj, event):
+        etype = event.type()
+        if etype in INPUT_EVENTS:
+            self._last_input = time.monotonic()
+            if self.idle:
+                self.idle = False
+                self.update_state()
+        elif obj is self.window:
+            if etype == QEvent.Show and self.window.windowHandle() is not None:
+                # Exposure changes (e.g. fully covered) are only delivered to the QWindow
+                self.window.windowHandle().installEventFilter(self)
+            if etype in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange,
+                         QEvent.WindowActivate, QEvent.WindowDeactivate):
+                self.update_state()
+            if etype == QEvent.Show:
+                self.start_metering()
+        elif etype == QEvent.Expose and obj is self.window.windowHandle():
+            self.exposed = obj.isExposed()
+            self.update_state()
+            self.start_metering()
+        return False
+
+    def start_metering(self):
+        if not self.metering:
+            self.metering = True
+            self.cpu.start(self.state)
+
+    def check_idle(self):
+        idle = time.monotonic() - self._last_input >= self.idle_seconds
+        if idle != self.idle:
+            self.idle = idle
+            self.update_state()
+
+    # --- State ---
+
+    def compute_state(self):
+        if not self.window.isVisible() or self.window.isMinimized() or not self.exposed:
+            return PAUSED
+        if self.idle or not self.window.isActiveWindow():
+            return PAUSED if self.mode == "low_power" else CAPPED
+        if self.mode in ("capped", "low_power"):
+            return CAPPED
+        return FULL
+
+    def update_state(self):
+        state = self.compute_state()
+        if state == self.state:
+            return
+        self.state = state
+        if self.metering:
+            self.cpu.switch(state)
+        for movie in self.movies:
+            self.apply_to_movie(movie)
+        if state == PAUSED:
+            self.finish_animations()
+        self.update_frame_timer()
+
+    def apply_to_movie(self, movie):
+        if movie.state() == QMovie.NotRunning:
+            movie.start()
+        # In capped mode frames are stepped by frame_timer instead of QMovie's own timer
+        movie.setPaused(self.state != FULL)
+        self.update_frame_timer()
+
+    def update_frame_timer(self):
+        if self.state == CAPPED and self.movies:
+            self.schedule_frames()
+        else:
+            self.frame_timer.stop()
+            self.frame_due = {}
+
+    def frame_interval(self, movie):
+        # Never faster than the GIF's own frame delay, nor than the cap
+        return max(movie.nextFrameDelay(), 1000 // self.fps_cap) / 1000
+
+    def schedule_frames(self):
+        now = time.monotonic()
+        self.frame_due = {movie: self.frame_due.get(movie) or now + self.frame_interval(movie)
+                          for movie in self.movies}
+        wait = min(self.frame_due.values()) - now
+        self.frame_timer.start(max(0, round(wait * 1000)))
+
+    def step_frames(self):
+        now = time.monotonic()
+        for movie in self.movies:
+            # A couple of ms of slack so a timer firing slightly early does not skip a frame
+            if self.frame_due.get(movie, now) <= now + 0.002:
+                if not movie.jumpToNextFrame():
+                    movie.jumpToFrame(0)
+                self.frame_due[movie] = now + self.frame_interval(movie)
+        self.schedule_frames()
+
+    def finish_animations(self):
+        # Nobody can see a fade while the window is hidden, so jump straight to the end
+        for animation in self.animations:
+            if animation.state() == QAbstractAnimation.Running:
+                animation.setCurrentTime(animation.totalDuration())
+        self.animations = []
+
+    def print_report(self):
+        print(self.cpu.format_report())
@@ -0,0 +1,93 @@
+import os
+import re
+import math
+from functools import lru_cache
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImageReader, QMovie
+
+VARIANT_PATTERN = re.compile(r"^(?P<name>.+)_(?P<w>\d+)x(?P<h>\d+)\.gif$")
+
+
+@lru_cache(maxsize=None)
+def list_variants(gif_path):
+    """Returns [(width, height, path)] for a background and its size variants from generate_backgrounds.py."""
+    folder, filename = os.path.split(gif_path)
+    name = os.path.splitext(filename)[0]
+    variants = []
+    if os.path.exists(gif_path):
+        size = QImageReader(gif_path).size()
+        variants.append((size.width(), size.height(), gif_path))
+    if os.path.isdir(folder or "."):
+        for entry in os.listdir(folder or "."):
+            match = VARIANT_PATTERN.match(entry)
+            if match and match.group("name") == name:
+                variants.append((int(match.group("w")), int(match.group("h")), os.path.join(folder, entry)))
+    return variants
+
+
+def pick_background_variant(gif_path, width, height):
+    """Picks the variant whose size is closest to width x height device pixels."""
+    variants = list_variants(gif_path)
+    if not variants or width <= 0 or height <= 0:
+        return gif_path
+    # Distance in log scale per axis, so 2x too big counts as much as 2x too small
+    return min(variants, key=lambda v: abs(math.log(v[0] / width)) + abs(math.log(v[1] / height)))[2]
+
+
+class BackgroundView(QLabel):
+    """Shows QMovie frames stretched to the label, decoding and scaling each frame once."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.movie = None
+        self.frames = {}
+        self.cache_bytes = 0
+        self.decoded_bytes = 0
+        # Shared by QMovie's decoded frames and the scaled frames below. The default fits any
+        # 400x600 background fully decoded; larger variants are decoded frame by frame
+        self.cache_budget = int(os.getenv("BACKGROUND_CACHE_MB", "48")) * 1024 * 1024
+
+    def device_size(self):
+        dpr = self.devicePixelRatioF()
+        return QSize(round(self.width() * dpr), round(self.height() * dpr))
+
+    def set_movie(self, movie):
+        if self.movie is not None:
+            self.movie.frameChanged.disconnect(self.show_frame)
+        self.movie = movie
+        self.clear_cache()
+
+        # Keep decoded frames in QMovie when they fit, GIF decoding dominates the frame time
+        size = QImageReader(movie.fileName()).size()
+        decoded = max(movie.frameCount(), 1) * size.width() * size.height() * 4
+        self.decoded_bytes = 0
+        if decoded <= self.cache_budget:
+            movie.setCacheMode(QMovie.CacheAll)
+            self.decoded_bytes = decoded
+        movie.frameChanged.connect(self.show_frame)
+
+    def clear_cache(self):
+        self.frames = {}
+        self.cache_bytes = 0
+
+    def resizeEvent(self, event):
+        self.clear_cache()
+        super().resizeEvent(event)
+        if self.movie is not None and self.movie.currentFrameNumber() >= 0:
+            self.show_frame(self.movie.currentFrameNumber())
+
+    def show_frame(self, number):
+        pixmap = self.frames.get(number)
+        if pixmap is None:
+            pixmap = self.movie.currentPixmap()
+            size = self.device_size()
+            if pixmap.size() != size and not size.isEmpty():
+                pixmap = pixmap.scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+                # Frames that needed scaling are kept until the next resize, within budget
+                cost = size.width() * size.height() * 4
+                if self.decoded_bytes + self.cache_bytes + cost <= self.cache_budget:
+                    self.frames[number] = pixmap
+                    self.cache_bytes += cost
+            pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.setPixmap(pixmap)
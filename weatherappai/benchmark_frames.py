@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import statistics
+
+# Measures how long the window takes to advance and repaint each background frame.
+# Usage (from this folder): python benchmark_frames.py [frames] [width] [height]
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from weather import WeatherApp
+
+
+def measure(window, frames):
+    movie = window.current_movie
+    movie.setPaused(True)
+    timings = []
+    for _ in range(frames):
+        # Decoding/scaling the next frame counts towards the frame time, not just painting it
+        start = time.perf_counter()
+        if not movie.jumpToNextFrame():
+            movie.jumpToFrame(0)
+        window.repaint()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 450
+    height = int(sys.argv[3]) if len(sys.argv) > 3 else 650
+
+    app = QApplication(sys.argv)
+    window = WeatherApp()
+    window.resize(width, height)
+    window.show()
+    app.processEvents()
+
+    # Warm up caches, then measure with the weather card visible
+    window.display_weather({
+        "main": {"temp": 293.15, "humidity": 40, "pressure": 1012, "feels_like": 292.0},
+        "weather": [{"description": "clear sky", "id": 800}],
+        "wind": {"speed": 3.1},
+    })
+    window.anim.setCurrentTime(window.anim.totalDuration())
+    app.processEvents()
+    measure(window, 20)
+
+    timings = measure(window, frames)
+    timings.sort()
+    print(f"{frames} frames at {width}x{height}: "
+          f"mean {statistics.mean(timings):.2f} ms, "
+          f"median {statistics.median(timings):.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+# Single entry point for generate_assets.py (icons) and generate_backgrounds.py (backgrounds).
+# Usage (from this folder): python build_assets.py [--dry-run] [--force] [--only icons|backgrounds]
+MANIFEST_PATH = "assets/.build-manifest.json"
+GROUPS = ("icons", "backgrounds")
+
+
+def load_targets(groups):
+    targets = []
+    # Imported lazily so building icons doesn't need Pillow
+    if "icons" in groups:
+        import generate_assets
+        targets += generate_assets.get_targets()
+    if "backgrounds" in groups:
+        import generate_backgrounds
+        targets += generate_backgrounds.get_targets()
+    return targets
+
+
+def params_hash(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def stale_reason(target, manifest):
+    """Returns why a target must be rebuilt, or None if its output is up to date."""
+    entry = manifest.get(target["output"])
+    if entry is None:
+        return "not in manifest"
+    if entry.get("params") != params_hash(target["params"]):
+        return "generator parameters changed"
+    if not os.path.exists(target["output"]):
+        return "output missing"
+    if entry.get("output") != file_hash(target["output"]):
+        return "output modified"
+    return None
+
+
+def build_target(target):
+    """Builds a target next to its output and only replaces the output if the bytes differ."""
+    output = target["output"]
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    root, ext = os.path.splitext(output)
+    tmp_path = f"{root}.building{ext}" # keep the extension, Pillow picks the format from it
+    try:
+        target["build"](tmp_path)
+        if os.path.exists(output) and file_hash(output) == file_hash(tmp_path):
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, output)
+        return True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally build the app's icons and backgrounds.")
+    parser.add_argument("--dry-run", action="store_true", help="only report which assets would be rebuilt")
+    parser.add_argument("--force", action="store_true", help="rebuild every asset")
+    parser.add_argument("--only", choices=GROUPS, action="append", help="limit the build to one asset group")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest()
+    targets = load_targets(args.only or GROUPS)
+    rebuilt = 0
+    for target in targets:
+        output = target["output"]
+        reason = "forced" if args.force else stale_reason(target, manifest)
+        if reason is None:
+            print(f"- {output}: up to date")
+            continue
+        rebuilt += 1
+        if args.dry_run:
+            print(f"- {output}: would rebuild ({reason})")
+            continue
+        changed = build_target(target)
+        manifest[output] = {"params": params_hash(target["params"]), "output": file_hash(output)}
+        # Save after every asset so an interrupted build keeps its progress
+        save_manifest(manifest)
+        print(f"- {output}: rebuilt ({reason}){'' if changed else ', output unchanged'}")
+
+    verb = "would rebuild" if args.dry_run else "rebuilt"
+    print(f"Done. {verb} {rebuilt} of {len(targets)} assets.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,196 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+import quota
+from city_files import read_cities
+from weather_api import fetch_weather, WeatherError, RateLimited, stats
+
+# Streams weather for a large list of cities to NDJSON or CSV.
+# Usage (from this folder): python bulk_export.py cities.csv -o weather.ndjson [--concurrency 8]
+# Re-running the same command after an interruption resumes from the checkpoint file.
+
+load_dotenv()
+
+CSV_FIELDS = ["index", "city", "status", "temp_c", "feels_like_c", "humidity", "pressure",
+              "wind_speed", "description", "weather_id", "error"]
+CHECKPOINT_EVERY = 2 # seconds between checkpoints
+
+
+class Checkpoint:
+    """Tracks finished input indices in constant space: everything below `watermark`, plus the few above it."""
+
+    def __init__(self, path):
+        self.path = path
+        self.watermark = 0
+        self.done = set()
+        self.output_size = 0
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        self.watermark = state["watermark"]
+        self.done = set(state["done"])
+        self.output_size = state["output_size"]
+        return True
+
+    def is_done(self, index):
+        return index < self.watermark or index in self.done
+
+    def mark(self, index):
+        self.done.add(index)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    def save(self, output_size):
+        self.output_size = output_size
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"watermark": self.watermark, "done": sorted(self.done),
+                       "output_size": output_size}, f)
+        os.replace(tmp_path, self.path)
+
+
+def to_csv_row(index, city, data, error):
+    row = {"index": index, "city": city, "status": "error" if error else "ok", "error": error or ""}
+    if data:
+        row.update({
+            "temp_c": f"{data['main']['temp'] - 273.15:.1f}",
+            "feels_like_c": f"{data['main']['feels_like'] - 273.15:.1f}",
+            "humidity": data['main']['humidity'],
+            "pressure": data['main']['pressure'],
+            "wind_speed": data['wind']['speed'],
+            "description": data['weather'][0]['description'],
+            "weather_id": data['weather'][0]['id'],
+        })
+    return row
+
+
+def export(args, api_key):
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "ndjson")
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint")
+    resumed = checkpoint.load() and os.path.exists(args.output)
+    if not resumed:
+        checkpoint = Checkpoint(checkpoint.path)
+
+    # Drop anything written after the last checkpoint, it will be fetched again
+    out = open(args.output, "r+" if resumed else "w", encoding="utf-8", newline="")
+    out.truncate(checkpoint.output_size)
+    out.seek(checkpoint.output_size)
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS) if output_format == "csv" else None
+    if writer and not resumed:
+        writer.writeheader()
+
+    # One HTTP session per worker thread so connections are reused
+    local = threading.local()
+
+    def fetch(city):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        while True:
+            try:
+                # Wait as long as the shared quota needs: a city is never written off for rate limits alone
+                return fetch_weather(city, api_key, session=local.session, timeout=args.timeout,
+                                     quota_wait=None), None
+            except RateLimited:
+                continue # a 429 emptied the shared bucket, so the retry waits for a fresh token
+            except WeatherError as e:
+                return None, str(e).replace("\n", " - ")
+            except Exception as e:
+                # One bad response must not end the whole export
+                return None, f"An unexpected error occurred: {e}"
+
+    def write_result(index, city, data, error):
+        if writer:
+            writer.writerow(to_csv_row(index, city, data, error))
+        else:
+            record = {"index": index, "city": city, "ok": error is None}
+            record.update({"data": data} if data else {"error": error})
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def save_checkpoint():
+        out.flush()
+        os.fsync(out.fileno())
+        checkpoint.save(out.tell())
+
+    cities = (item for item in read_cities(args.input) if not checkpoint.is_done(item[0]))
+    pending = {}
+    fetched = failed = 0
+    started = last_checkpoint = time.monotonic()
+    if resumed:
+        print(f"Resuming after {checkpoint.watermark} cities", file=sys.stderr)
+
+    pool = ThreadPoolExecutor(max_workers=args.concurrency)
+    try:
+        exhausted = False
+        while pending or not exhausted:
+            # Keep at most 2x concurrency cities in memory at any time
+            while not exhausted and len(pending) < args.concurrency * 2:
+                item = next(cities, None)
+                if item is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(fetch, item[1])] = item
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, city = pending.pop(future)
+                data, error = future.result()
+                write_result(index, city, data, error)
+                checkpoint.mark(index)
+                fetched += 1
+                failed += error is not None
+
+            if time.monotonic() - last_checkpoint >= CHECKPOINT_EVERY:
+                save_checkpoint()
+                last_checkpoint = time.monotonic()
+    except KeyboardInterrupt:
+        # Requests already in flight finish in the background but are not recorded
+        pool.shutdown(wait=False, cancel_futures=True)
+        save_checkpoint()
+        out.close()
+        print(f"\nInterrupted after {fetched} cities, re-run the same command to resume.", file=sys.stderr)
+        return 130
+    pool.shutdown()
+
+    out.close()
+    if os.path.exists(checkpoint.path):
+        os.remove(checkpoint.path)
+    elapsed = time.monotonic() - started
+    print(f"Done. {fetched} cities ({failed} errors) in {elapsed:.1f}s -> {args.output}", file=sys.stderr)
+    print(quota.describe(api_key), file=sys.stderr)
+    print(stats.describe(), file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export current weather for a list of cities.")
+    parser.add_argument("input", help="CSV file with a 'city' column, or a text file with one city per line")
+    parser.add_argument("-o", "--output", required=True, help="output file (.ndjson or .csv)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="output format (default: from the extension)")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once (default 8)")
+    parser.add_argument("--timeout", type=float, default=10, help="per-request timeout in seconds")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint)")
+    args = parser.parse_args(argv)
+
+    api_key = os.getenv("API_KEY")
+    if not api_key:
+        print("API Key Missing", file=sys.stderr)
+        return 1
+    return export(args, api_key)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
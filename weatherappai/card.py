@@ -0,0 +1,114 @@
+from PyQt5.QtWidgets import (QFrame, QWidget, QGraphicsScene, QGraphicsPixmapItem,
+                             QGraphicsBlurEffect)
+from PyQt5.QtCore import Qt, QEvent, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap, QImage
+
+# Card chrome (previously the QFrame#Card stylesheet rule)
+CARD_RADIUS = 25
+CARD_FILL = QColor(20, 20, 30, 191)
+CARD_BORDER = QColor(255, 255, 255, 25)
+
+# Shadow (previously a live QGraphicsDropShadowEffect on the card)
+SHADOW_BLUR = 30
+SHADOW_OFFSET = 10
+SHADOW_COLOR = QColor(0, 0, 0, 80)
+
+
+def render_card_chrome(width, height, dpr):
+    pixmap = QPixmap(int(width * dpr), int(height * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0.5, 0.5, width - 1, height - 1), CARD_RADIUS, CARD_RADIUS)
+    painter.fillPath(path, CARD_FILL)
+    painter.setPen(QPen(CARD_BORDER, 1))
+    painter.drawPath(path)
+    painter.end()
+    return pixmap
+
+
+def render_card_shadow(width, height, dpr):
+    # Blur once through a throwaway scene instead of on every repaint.
+    # QGraphicsDropShadowEffect would also draw the card itself, which Card paints already,
+    # so blur a shadow-coloured copy of the card's shape and draw only that.
+    shape = render_card_chrome(width, height, dpr)
+    painter = QPainter(shape)
+    painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+    painter.fillRect(shape.rect(), SHADOW_COLOR)
+    painter.end()
+    item = QGraphicsPixmapItem(shape)
+    item.setOffset(0, SHADOW_OFFSET)
+    effect = QGraphicsBlurEffect()
+    # Half the radius gives the drop shadow effect's falloff (compared pixel by pixel against it)
+    effect.setBlurRadius(SHADOW_BLUR / 2)
+    item.setGraphicsEffect(effect)
+    scene = QGraphicsScene()
+    scene.addItem(item)
+
+    margin = SHADOW_BLUR
+    rect = QRectF(-margin, -margin, width + 2 * margin, height + 2 * margin + SHADOW_OFFSET)
+    image = QImage(int(rect.width() * dpr), int(rect.height() * dpr), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(image.rect()), rect)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+class Card(QFrame):
+    """Frame that paints its rounded chrome from a cached pixmap."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._chrome = None
+
+    def resizeEvent(self, event):
+        self._chrome = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        if self._chrome is None or self._chrome.devicePixelRatio() != dpr:
+            self._chrome = render_card_chrome(self.width(), self.height(), dpr)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._chrome)
+
+
+class CardShadow(QWidget):
+    """Sibling drawn under a Card, following its geometry, with a pre-blurred shadow."""
+
+    def __init__(self, card, parent):
+        super().__init__(parent)
+        self.card = card
+        self._pixmap = None
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        card.installEventFilter(self)
+        self.follow_card()
+
+    def eventFilter(self, obj, event):
+        if obj is self.card and event.type() in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide):
+            self.follow_card()
+        return False
+
+    def follow_card(self):
+        geometry = self.card.geometry()
+        self.setGeometry(geometry.adjusted(-SHADOW_BLUR, -SHADOW_BLUR,
+                                           SHADOW_BLUR, SHADOW_BLUR + SHADOW_OFFSET))
+        self.setVisible(self.card.isVisible())
+        self.stackUnder(self.card)
+
+    def resizeEvent(self, event):
+        self._pixmap = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        if self._pixmap is None or self._pixmap.devicePixelRatio() != dpr:
+            self._pixmap = render_card_shadow(self.card.width(), self.card.height(), dpr)
+        painter = QPainter(self)
+        painter.drawPixmap(QPointF(0, 0), self._pixmap)
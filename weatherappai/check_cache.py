@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+import json
+import tempfile
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+# Checks when cached observations are served, revalidated or refetched, on a simulated clock.
+# Usage (from this folder): python check_cache.py
+os.environ["QUOTA_FILE"] = os.path.join(tempfile.mkdtemp(), "quota.json")
+os.environ["API_RATE_PER_MINUTE"] = "100000"
+
+import weather_api
+
+HOUR = 3600
+STEP = 10 # seconds between fetches of the same city
+
+
+class FakeSession:
+    """Stands in for requests.Session: one station whose observation time comes from observed(now)."""
+
+    def __init__(self, observed, honours_validators=True):
+        self.observed = observed
+        self.honours_validators = honours_validators
+        self.now = 0
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        dt = self.observed(self.now)
+        etag = f'"{dt}"'
+        response = Response()
+        response.url = url
+        response.headers = CaseInsensitiveDict({"ETag": etag})
+        if self.honours_validators and headers.get("If-None-Match") == etag:
+            response.status_code, body = 304, b""
+        else:
+            response.status_code = 200
+            body = json.dumps({"cod": 200, "id": 2643743, "name": "London", "dt": dt}).encode()
+        response.raw = io.BytesIO(body)
+        response._content = response.raw.read()
+        self.calls.append((self.now, response.status_code))
+        return response
+
+
+def simulate(session, duration=HOUR):
+    weather_api.cache = weather_api.WeatherCache()
+    start = 1_700_000_000
+    for second in range(0, duration, STEP):
+        session.now = start + second
+        data = weather_api.fetch_cached(weather_api.cache.lookup(2643743), {"id": 2643743}, "key",
+                                        session=session, now=session.now)
+        assert data["id"] == 2643743 # cached body reused on 304
+    return [(now - start, status) for now, status in session.calls]
+
+
+def check(name, calls, expected):
+    ok = calls == expected
+    print(f"{'ok  ' if ok else 'FAIL'} {name}: {len(calls)} requests {calls}")
+    return ok
+
+
+if __name__ == "__main__":
+    interval = weather_api.CACHE_TTL
+    # The simulated clock starts 200 s past a 10-minute boundary, so stations below publish at 50, 650, 1250...
+    backoff = [0, 60, 180, 420, 900, 1500, 2100, 2700, 3300] # rechecks 60, 120, 240, 480 s apart, then every interval
+    results = [
+        # A station that stopped reporting 20 minutes ago: revalidations back off to one per interval, all 304
+        check("stale dt", simulate(FakeSession(lambda now: 1_700_000_000 - 1200)),
+              [(t, 200 if t == 0 else 304) for t in backoff]),
+        # Same station behind a server that ignores validators: same schedule, full responses
+        check("validators ignored", simulate(FakeSession(lambda now: 1_700_000_000 - 1200, False)),
+              [(t, 200) for t in backoff]),
+        # A station whose observations are published at their dt: fetched as each one appears
+        check("updating station", simulate(FakeSession(lambda now: (now - 250) // interval * interval + 250)),
+              [(t, 200) for t in [0, 60, 650, 1250, 1850, 2450, 3050]]),
+        # Observations published 250 s after their dt: asked at dt + interval, then backing off until it appears
+        check("late station", simulate(FakeSession(lambda now: (now - 250) // interval * interval)),
+              [(0, 200), (60, 200)] + [(t + offset, status) for t in range(0, HOUR, interval)
+                                       for offset, status in [(400, 304), (520, 304), (760, 200)]
+                                       if t + offset < HOUR]),
+    ]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,38 @@
+import csv
+
+# City lists shared by the bulk export and the dashboard watchlist
+
+
+def read_cities(path):
+    """Yields (index, city) from a CSV with a "city" column or a plain newline list, one line at a time."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if not path.lower().endswith(".csv"):
+            index = 0
+            for line in f:
+                city = line.strip()
+                if city and not city.startswith("#"):
+                    yield index, city
+                    index += 1
+            return
+
+        rows = csv.reader(f)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [name.strip().lower() for name in header]
+        if "city" in columns:
+            column = columns.index("city")
+        else:
+            # No header row, the first column holds the city names
+            column = 0
+            rows = _prepend(header, rows)
+        index = 0
+        for row in rows:
+            if len(row) > column and row[column].strip():
+                yield index, row[column].strip()
+                index += 1
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
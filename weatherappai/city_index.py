@@ -0,0 +1,105 @@
+import os
+import gzip
+import json
+import math
+import threading
+
+# Offline nearest-city lookup over OpenWeather's city list (city.list.json or .json.gz from
+# https://bulk.openweathermap.org/sample/). Set CITY_LIST in .env to its path.
+DEFAULT_CITY_LIST = "assets/city.list.json.gz"
+EARTH_RADIUS_KM = 6371.0
+
+
+def to_unit_vector(lat, lon):
+    # Points on the unit sphere: straight-line distance grows with great-circle distance
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class CityIndex:
+    """KD-tree of cities on the unit sphere, stored as flat lists."""
+
+    def __init__(self, cities):
+        # cities: iterable of (city_id, name, country, lat, lon)
+        self.cities = list(cities)
+        self.points = [to_unit_vector(c[3], c[4]) for c in self.cities]
+        count = len(self.cities)
+        self.node_city = [0] * count
+        self.node_axis = [0] * count
+        self.left = [-1] * count
+        self.right = [-1] * count
+        self._next = 0
+        self.root = self._build(list(range(count)))
+
+    @classmethod
+    def from_file(cls, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            records = json.load(f)
+        return cls((r["id"], r["name"], r.get("country", ""), r["coord"]["lat"], r["coord"]["lon"])
+                   for r in records)
+
+    def _build(self, items):
+        if not items:
+            return -1
+        # Split on the axis with the largest spread, at the median
+        spreads = []
+        for axis in range(3):
+            values = [self.points[i][axis] for i in items]
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+        items.sort(key=lambda i: self.points[i][axis])
+        middle = len(items) // 2
+
+        node = self._next
+        self._next += 1
+        self.node_city[node] = items[middle]
+        self.node_axis[node] = axis
+        self.left[node] = self._build(items[:middle])
+        self.right[node] = self._build(items[middle + 1:])
+        return node
+
+    def nearest(self, lat, lon):
+        """Returns ((city_id, name, country, lat, lon), distance_km) for the closest city, or None."""
+        if self.root < 0:
+            return None
+        target = to_unit_vector(lat, lon)
+        best, best_dist = -1, float("inf")
+        # (node, squared distance from target to the node's region) - regions farther than the best match are skipped
+        stack = [(self.root, 0.0)]
+        points, node_city, node_axis = self.points, self.node_city, self.node_axis
+        left, right = self.left, self.right
+        while stack:
+            node, bound = stack.pop()
+            if node < 0 or bound >= best_dist:
+                continue
+            city = node_city[node]
+            point = points[city]
+            dx, dy, dz = point[0] - target[0], point[1] - target[1], point[2] - target[2]
+            dist = dx * dx + dy * dy + dz * dz
+            if dist < best_dist:
+                best, best_dist = city, dist
+            axis = node_axis[node]
+            diff = target[axis] - point[axis]
+            near, far = (left[node], right[node]) if diff < 0 else (right[node], left[node])
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        return self.cities[best], chord_to_km(math.sqrt(best_dist))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def default_index():
+    """Loads the index for CITY_LIST once; returns None if no city list is installed."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = os.getenv("CITY_LIST", DEFAULT_CITY_LIST)
+            _index = CityIndex.from_file(path) if os.path.exists(path) else False
+        return _index or None
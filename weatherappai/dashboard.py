@@ -0,0 +1,284 @@
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtWidgets import QWidget, QListView, QStyledItemDelegate, QVBoxLayout, QLabel, QStyle
+from PyQt5.QtCore import Qt, QObject, QAbstractListModel, QModelIndex, QSize, QRect, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QMovie, QPainter, QPixmap
+from animation import AnimationController
+from background import BackgroundView, pick_background_variant
+from card import render_card_chrome, CARD_RADIUS
+from weather_api import fetch_weather, fetch_weather_by_coords, parse_coordinates, WeatherError, CACHE_TTL
+from city_files import read_cities
+
+# Multi-city dashboard: python weather.py --dashboard [watchlist.txt]
+# Tiles are painted by a delegate, so only visible tiles cost anything and no widgets are created per city.
+TILE_SIZE = QSize(230, 160)
+ICON_SIZE = 48
+FETCH_WORKERS = 4
+FETCH_DELAY_MS = 150 # wait for scrolling to settle before fetching what is on screen
+SUMMARY_LIMIT = 500 # tiles kept formatted; older ones are refetched (usually from the API cache)
+RETRY_DELAY = 30 # seconds before a failed tile is fetched again, doubled per failure up to CACHE_TTL
+
+SUMMARY_ROLE = Qt.UserRole
+ERROR_ROLE = Qt.UserRole + 1
+
+
+def summarize(data, icon_path_for):
+    """Keeps only the strings a tile paints, formatted once when the data arrives."""
+    main = data['main']
+    return {
+        "temperature": f"{main['temp'] - 273.15:.0f}°C",
+        "description": data['weather'][0]['description'],
+        "icon": icon_path_for(data['weather'][0]['id']),
+        "details": [
+            # Same fields as details_grid, with labels short enough for a tile
+            f"🤔 Feels {main['feels_like'] - 273.15:.0f}°C",
+            f"💧 {main['humidity']}%",
+            f"🌬 {data['wind']['speed']} m/s",
+            f"🌡 {main['pressure']} hPa",
+        ],
+    }
+
+
+class FetchBridge(QObject):
+    # Emitted from pool threads, delivered on the GUI thread
+    fetched = pyqtSignal(int, object, str)
+
+
+class WatchlistModel(QAbstractListModel):
+    """City names plus whatever weather has been fetched for the rows that were shown."""
+
+    def __init__(self, cities, api_key, icon_path_for, parent=None):
+        super().__init__(parent)
+        self.cities = cities
+        self.api_key = api_key
+        self.icon_path_for = icon_path_for
+        self.summaries = OrderedDict() # row -> (fetched_at, summary), least recently shown first
+        self.errors = {} # row -> (failed_at, message, failures in a row)
+        self.in_flight = set()
+        self.wanted = set()
+        self.is_visible = lambda row: True
+        self.fetch_timer = QTimer(self)
+        self.fetch_timer.setSingleShot(True)
+        self.fetch_timer.setInterval(FETCH_DELAY_MS)
+        self.fetch_timer.timeout.connect(self.fetch_wanted)
+        self.pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        self.bridge = FetchBridge()
+        self.bridge.fetched.connect(self.on_fetched)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.cities)
+
+    def data(self, index, role=Qt.DisplayRole):
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.cities[row]
+        if role == SUMMARY_ROLE:
+            entry = self.summaries.get(row)
+            if entry is None:
+                return None
+            self.summaries.move_to_end(row)
+            return entry[1]
+        if role == ERROR_ROLE:
+            if not self.api_key:
+                return "API Key Missing"
+            error = self.errors.get(row)
+            return error[1] if error else None
+        return None
+
+    def ensure_fetched(self, row):
+        # Called while painting; the fetch itself waits until scrolling has settled
+        if not self.api_key or row in self.in_flight:
+            return
+        now = time.time()
+        entry = self.summaries.get(row)
+        if entry and now - entry[0] < CACHE_TTL:
+            return
+        # A failed fetch keeps the tile's last summary, so back off instead of retrying on every paint
+        error = self.errors.get(row)
+        if error and now - error[0] < min(CACHE_TTL, RETRY_DELAY * 2 ** (error[2] - 1)):
+            return
+        self.wanted.add(row)
+        self.fetch_timer.start()
+
+    def fetch_wanted(self):
+        # Tiles that were scrolled past in the meantime are dropped
+        for row in self.wanted:
+            if row not in self.in_flight and self.is_visible(row):
+                self.in_flight.add(row)
+                self.pool.submit(self.fetch, row, self.cities[row])
+        self.wanted = set()
+
+    def fetch(self, row, city):
+        try:
+            coordinates = parse_coordinates(city)
+            if coordinates:
+                data = fetch_weather_by_coords(*coordinates, self.api_key)
+            else:
+                data = fetch_weather(city, self.api_key)
+            self.bridge.fetched.emit(row, summarize(data, self.icon_path_for), "")
+        except WeatherError as e:
+            self.bridge.fetched.emit(row, None, str(e).split("\n")[0])
+        except Exception as e:
+            self.bridge.fetched.emit(row, None, f"An unexpected error occurred: {e}")
+
+    def on_fetched(self, row, summary, error):
+        self.in_flight.discard(row)
+        if summary is not None:
+            self.summaries[row] = (time.time(), summary)
+            self.summaries.move_to_end(row)
+            self.errors.pop(row, None)
+            while len(self.summaries) > SUMMARY_LIMIT:
+                self.summaries.popitem(last=False)
+        else:
+            failures = self.errors[row][2] + 1 if row in self.errors else 1
+            self.errors[row] = (time.time(), error, failures)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TileDelegate(QStyledItemDelegate):
+    """Paints a tile with the same fields as the single-city details grid."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.icons = {} # path -> QPixmap scaled once, shared by every tile
+        self.chrome = None
+        self.title_font = QFont("Segoe UI", 12, QFont.DemiBold)
+        self.temperature_font = QFont("Segoe UI", 24, QFont.Light)
+        self.body_font = QFont("Segoe UI", 9)
+
+    def sizeHint(self, option, index):
+        return TILE_SIZE
+
+    def icon(self, path, dpr):
+        pixmap = self.icons.get(path)
+        if pixmap is None:
+            source = QPixmap(path)
+            if source.isNull():
+                pixmap = QPixmap()
+            else:
+                pixmap = source.scaled(int(ICON_SIZE * dpr), int(ICON_SIZE * dpr),
+                                       Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pixmap.setDevicePixelRatio(dpr)
+            self.icons[path] = pixmap
+        return pixmap
+
+    def paint(self, painter, option, index):
+        index.model().ensure_fetched(index.row())
+        rect = option.rect.adjusted(6, 6, -6, -6)
+        dpr = painter.device().devicePixelRatioF()
+        if self.chrome is None or self.chrome.devicePixelRatio() != dpr:
+            self.chrome = render_card_chrome(rect.width(), rect.height(), dpr)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(rect.topLeft(), self.chrome)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QColor("#4facfe"))
+            painter.drawRoundedRect(rect, CARD_RADIUS, CARD_RADIUS)
+
+        inner = rect.adjusted(14, 10, -14, -10)
+        painter.setPen(QColor("#ffffff"))
+        painter.setFont(self.title_font)
+        painter.drawText(QRect(inner.left(), inner.top(), inner.width(), 22), Qt.AlignLeft | Qt.AlignVCenter,
+                         painter.fontMetrics().elidedText(index.data(), Qt.ElideRight, inner.width()))
+
+        summary = index.data(SUMMARY_ROLE)
+        error = index.data(ERROR_ROLE)
+        body = QRect(inner.left(), inner.top() + 26, inner.width(), inner.height() - 26)
+        if summary is None:
+            painter.setPen(QColor("#aaddff") if error is None else QColor("#ff9a9a"))
+            painter.setFont(self.body_font)
+            painter.drawText(body, Qt.AlignCenter, error or "Loading…")
+            painter.restore()
+            return
+
+        icon = self.icon(summary["icon"], dpr)
+        if not icon.isNull():
+            painter.drawPixmap(body.right() - ICON_SIZE, body.top(), icon)
+        painter.setFont(self.temperature_font)
+        painter.drawText(QRect(body.left(), body.top(), body.width() - ICON_SIZE, 36),
+                         Qt.AlignLeft | Qt.AlignVCenter, summary["temperature"])
+        painter.setFont(self.body_font)
+        painter.setPen(QColor("#e0e0e0"))
+        painter.drawText(QRect(body.left(), body.top() + 36, body.width() - ICON_SIZE, 16),
+                         Qt.AlignLeft | Qt.AlignVCenter, summary["description"])
+
+        # 2x2 details, same layout as details_grid
+        painter.setPen(QColor("#cccccc"))
+        half = body.width() // 2
+        for i, text in enumerate(summary["details"]):
+            cell = QRect(body.left() + (i % 2) * half, body.top() + 58 + (i // 2) * 18, half, 18)
+            painter.drawText(cell, Qt.AlignLeft | Qt.AlignVCenter,
+                             painter.fontMetrics().elidedText(text, Qt.ElideRight, half - 4))
+        painter.restore()
+
+
+class DashboardWindow(QWidget):
+    def __init__(self, cities, api_key, icon_path_for):
+        super().__init__()
+        self.setWindowTitle("Weather Dashboard")
+        self.resize(1000, 700)
+
+        # One background movie for the whole dashboard
+        self.background_label = BackgroundView(self)
+        self.animations = AnimationController(self)
+        self.background_path = "assets/backgrounds/default.gif"
+        self.current_movie = None
+
+        self.model = WatchlistModel(cities, api_key, icon_path_for, self)
+        self.view = QListView()
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setMovement(QListView.Static)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setUniformItemSizes(True)
+        self.view.setGridSize(TILE_SIZE)
+        self.view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.view.setItemDelegate(TileDelegate(self.view))
+        self.view.setModel(self.model)
+        self.model.is_visible = self.is_row_visible
+        self.view.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.view.viewport().setAutoFillBackground(False)
+
+        title = QLabel(f"Watching {len(cities)} cities")
+        title.setStyleSheet("color: white; font-size: 18px; font-weight: 600; background: transparent;")
+        layout = QVBoxLayout(self)
+        layout.addWidget(title)
+        layout.addWidget(self.view)
+
+        self.set_background_movie(self.background_path)
+
+    def is_row_visible(self, row):
+        return self.view.visualRect(self.model.index(row)).intersects(self.view.viewport().rect())
+
+    def set_background_movie(self, gif_path):
+        if not os.path.exists(gif_path):
+            return
+        if self.current_movie:
+            self.animations.stop_movie(self.current_movie)
+        size = self.background_label.device_size()
+        self.current_movie = QMovie(pick_background_variant(gif_path, size.width(), size.height()))
+        self.background_label.set_movie(self.current_movie)
+        self.animations.start_movie(self.current_movie)
+        self.background_label.lower()
+
+    def resizeEvent(self, event):
+        self.background_label.setGeometry(0, 0, self.width(), self.height())
+        super().resizeEvent(event)
+        if self.current_movie:
+            size = self.background_label.device_size()
+            if pick_background_variant(self.background_path, size.width(), size.height()) != self.current_movie.fileName():
+                self.set_background_movie(self.background_path)
+
+    def closeEvent(self, event):
+        self.model.shutdown()
+        super().closeEvent(event)
+
+
+def load_watchlist(path):
+    return [city for _, city in read_cities(path)] if os.path.exists(path) else []
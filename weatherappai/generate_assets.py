@@ -1,8 +1,6 @@
-import os
 import base64
-
-# Create directories
-os.makedirs("assets/icons", exist_ok=True)
+import hashlib
+import sys
 
 # Base64 encoded assets (Simulated for this script - using simple colored circles/shapes if I were drawing, but here I'll use some standard base64 for a spinner and simple icons to ensure they work)
 
@@ -44,12 +42,28 @@ snow_png = "iVBORw0KGgoAAAANSUhEUgAAADIAAAAyCAYAAAAeP4ixAAAACXBIWXMAAAsTAAALEwEA
 mist_png = "iVBORw0KGgoAAAANSUhEUgAAADIAAAAyCAYAAAAeP4ixAAAACXBIWXMAAAsTAAALEwEAmpwYAAAEi0lEQVR4nO2aW2wUVRTHf2d22+12S7vFFrS0UCoF+gKhgDVqY4L6QCKCJhjjg488+GATYzQx8cVEH0w0PvhgYoyJ8UFiDNEYiYoPfWlMIFi0FVoKLeVju93t7ozP7M7Q7XZndreFfNnJ7M69c+b/3XPmnDtnFArF/5U00w2Ih/FIIB5GoyEekYhHJOKRiHgkIh6JiEci4hH5X0L8/f3lTU1N9x45cqT82LFjd/f29t4thChVSqVIKbM1TXucy+XW5XK5VYuLi2tXrly5ubq6+vOvfKMgIoxEIt92d3c/d/DgwdVdXV13hUIhFEWhvLycyspKdV1KSSAQIBgMEgwGCQaD+P1+vF4vXq/X63a7n8tkMmsrKys/X7FicTz1jYCIcDj87YEDB57r7e1dHQwGsdvtVFVVUV1djdPp1D2nlCIajRIOh4lEIsTjcSKRCKFQiHg8js/no6SkhEgk4u3t7V3V19f39fLlyzfHUueYI6K+vv6Zzs7O1X6/H4fDQV1dHTU1NQAopYhEIgwODhIMBomkf662tpaamhoqKyvVdY/Hg8/no7Ozk46ODnRdJy8vj87OzuV1dXVPHThw4Nux0DsmiLq6umd8Pl95SUkJW7ZsYePGjQDE43F6e3vp7u4mGo1it9upq6tj06ZNOJ1OdV84HCYcDtPd3U1fXx+xWIyysjK6urqW1dTUPLN///6vR0vzmCBCoVAlQGlpKZWVlQAkk0k6Ozvp7+9HCIHf72fLli2UlZWp+wcGBujp6SEajZKXl0dpaSkiFAr5R0vrmCB8Pp8PEAgEAFBKMTAwQF9fHwB2u52tW7dSVFSk7utX/y8vLycvLw+fzwfQOzIyM8YckXA47AOoqqpS16LRKD09PQAopdi8eTMlJSXq+sDAAH19ffj9frxeL3l5ecRisbF7RCRCXl4eDoeDaDRKT08PyWQSgM2bN5Obm6uuDw4O0tfXRyAQwG63k5eXp+4fLS1jgjidTgACgQDBYJBgMAhAcXExW7ZswWazqeuD7n/w4EHsdrv6vY3UjDHniMPhwG63q/FHKUVJSQmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdMW8jY4IIh8M+gLy8PHVdKUVZWRmbN29Wv4vH4/T29hKNRrHb7Rw8eBCn06nu03WdlbnR2Z2hvmwB2aH11Y4t1b3R+lIEDXouHhwB0Z2J7lI+Sk5x2Y5yWZwBtZ5yOXZd2Z8qOm2Vpm252xI+UkWd2aZ6Ubm+Mm2Vtlmt63Y+Vl5tmb46bZm9tnJ8A2o+Wl2pubG2cnWd2Z2dvm512bW+WlwDdl5aXam9tZ5ydZ3ZnaG+bnXZtbpSWl2pubW2cnWd2Z2hvm512bW+UlwAAOw=="
 
 
-write_b64("assets/loading.gif", loading_gif)
-write_b64("assets/icons/sun.png", sun_png)
-write_b64("assets/icons/cloud.png", cloud_png)
-write_b64("assets/icons/rain.png", rain_png)
-write_b64("assets/icons/thunder.png", thunder_png)
-write_b64("assets/icons/snow.png", snow_png)
-write_b64("assets/icons/mist.png", mist_png)
+# Output path -> base64 payload
+ASSETS = {
+    "assets/loading.gif": loading_gif,
+    "assets/icons/sun.png": sun_png,
+    "assets/icons/cloud.png": cloud_png,
+    "assets/icons/rain.png": rain_png,
+    "assets/icons/thunder.png": thunder_png,
+    "assets/icons/snow.png": snow_png,
+    "assets/icons/mist.png": mist_png,
+}
+
+def get_targets():
+    """Build targets for build_assets.py, keyed by the hash of each payload."""
+    targets = []
+    for path, data in ASSETS.items():
+        targets.append({
+            "output": path,
+            "params": {"generator": "base64", "sha256": hashlib.sha256(data.encode()).hexdigest()},
+            "build": lambda out, data=data: write_b64(out, data),
+        })
+    return targets
 
-print("Assets generated successfully.")
+if __name__ == "__main__":
+    import build_assets
+    build_assets.main(["--only", "icons"] + sys.argv[1:])
@@ -1,61 +1,73 @@
 from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
-import os
+import sys
 import math
 import random
+import inspect
+import hashlib
+import PIL
 
-# Create directories
-os.makedirs("assets/backgrounds", exist_ok=True)
-
+# Base size the scenes were designed at; other variants scale their details from it
 WIDTH, HEIGHT = 400, 600
 
+# Size variants emitted per scene. The base size keeps the plain "<scene>.gif" name,
+# the others are "<scene>_<w>x<h>.gif" and are picked by the app for large/HiDPI windows.
+VARIANTS = [(400, 600), (800, 1200), (1440, 900)]
+
 def create_gradient(width, height, top_color, bottom_color):
     """Creates a vertical linear gradient image."""
-    base = Image.new('RGB', (width, height), top_color)
+    # Fill a single column, then stretch it sideways (rows are constant)
+    column = Image.new('RGB', (1, height), top_color)
     top_r, top_g, top_b = top_color
     bot_r, bot_g, bot_b = bottom_color
 
-    pixels = base.load()
+    pixels = column.load()
     for y in range(height):
         # Interpolate colors
         ratio = y / height
         r = int(top_r + (bot_r - top_r) * ratio)
         g = int(top_g + (bot_g - top_g) * ratio)
         b = int(top_b + (bot_b - top_b) * ratio)
-        for x in range(width):
-            pixels[x, y] = (r, g, b)
-    return base
+        pixels[0, y] = (r, g, b)
+    return column.resize((width, height), Image.NEAREST)
+
+def detail_scale(width, height):
+    """Scale factor for sizes, speeds and blur radii relative to the base size."""
+    return min(width / WIDTH, height / HEIGHT)
 
-def create_cinematic_sunny():
+def create_cinematic_sunny(path, rng, width=WIDTH, height=HEIGHT):
     """Generates a warm, glowing sunny scene with subtle heat haze/rays."""
     frames = []
+    s = detail_scale(width, height)
     # Deep sky blue to warm golden horizon
-    bg_base = create_gradient(WIDTH, HEIGHT, (20, 100, 200), (255, 220, 150))
+    bg_base = create_gradient(width, height, (20, 100, 200), (255, 220, 150))
     
     # Sun Glow (Large radial gradient simulation using layers)
-    sun_glow = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+    sun_glow = Image.new('RGBA', (width, height), (0, 0, 0, 0))
     draw_glow = ImageDraw.Draw(sun_glow)
     
     # Multiple transparent circles for soft bloom
-    center_x, center_y = WIDTH // 2, HEIGHT // 5
-    for r in range(150, 0, -5):
-        alpha = int(255 * (1 - (r / 150)) * 0.1) # Fade out edges
+    center_x, center_y = width // 2, height // 5
+    glow_radius = int(150 * s)
+    for r in range(glow_radius, 0, -int(5 * s)):
+        alpha = int(255 * (1 - (r / glow_radius)) * 0.1) # Fade out edges
         draw_glow.ellipse([center_x - r, center_y - r, center_x + r, center_y + r], fill=(255, 255, 200, alpha))
     
     # Blur the glow heavily
-    sun_glow = sun_glow.filter(ImageFilter.GaussianBlur(20))
+    sun_glow = sun_glow.filter(ImageFilter.GaussianBlur(20 * s))
 
     for i in range(20):
         frame = bg_base.copy()
         frame.paste(sun_glow, (0, 0), sun_glow)
 
         # Subtle pulsing of the sun core
-        overlay = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+        overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
-        pulse = 5 + 2 * math.sin(i * 0.3)
+        pulse = (5 + 2 * math.sin(i * 0.3)) * s
         
         # Sun Core
-        draw.ellipse([center_x - 40 - pulse, center_y - 40 - pulse, 
-                      center_x + 40 + pulse, center_y + 40 + pulse], 
+        core = 40 * s
+        draw.ellipse([center_x - core - pulse, center_y - core - pulse, 
+                      center_x + core + pulse, center_y + core + pulse], 
                      fill=(255, 255, 240, 200))
         
         # God Rays (Rotating transparent wedges)
@@ -63,52 +75,55 @@ def create_cinematic_sunny():
         for angle in range(0, 360, 30):
             # Rotate slowly
             rad = math.radians(angle + i)
-            end_x = center_x + 300 * math.cos(rad)
-            end_y = center_y + 300 * math.sin(rad)
-            draw.line([center_x, center_y, end_x, end_y], fill=(255, 255, 255, 15), width=20)
+            end_x = center_x + 300 * s * math.cos(rad)
+            end_y = center_y + 300 * s * math.sin(rad)
+            draw.line([center_x, center_y, end_x, end_y], fill=(255, 255, 255, 15), width=int(20 * s))
         
-        overlay = overlay.filter(ImageFilter.GaussianBlur(10)) # Soften rays
+        overlay = overlay.filter(ImageFilter.GaussianBlur(10 * s)) # Soften rays
         
         frame.paste(overlay, (0, 0), overlay)
         frames.append(frame)
 
-    frames[0].save('assets/backgrounds/sunny.gif', save_all=True, append_images=frames[1:], duration=100, loop=0)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
 
-def create_cinematic_rainy():
+def create_cinematic_rainy(path, rng, width=WIDTH, height=HEIGHT):
     """Generates a moody, dark rainy scene with depth (parallax rain)."""
     frames = []
+    s = detail_scale(width, height)
     # Dark slate/navy gradient
-    bg_base = create_gradient(WIDTH, HEIGHT, (15, 20, 30), (40, 50, 70))
+    bg_base = create_gradient(width, height, (15, 20, 30), (40, 50, 70))
     
-    drops_bg = [[random.randint(0, WIDTH), random.randint(0, HEIGHT), random.randint(3, 8)] for _ in range(80)]
-    drops_fg = [[random.randint(0, WIDTH), random.randint(0, HEIGHT), random.randint(10, 20)] for _ in range(40)]
+    # Keep the same rain density on bigger canvases
+    density = width * height / (WIDTH * HEIGHT)
+    drops_bg = [[rng.randint(0, width), rng.randint(0, height), rng.randint(int(3 * s), int(8 * s))] for _ in range(int(80 * density))]
+    drops_fg = [[rng.randint(0, width), rng.randint(0, height), rng.randint(int(10 * s), int(20 * s))] for _ in range(int(40 * density))]
 
     for i in range(15): # Short loop, high fps feel
         frame = bg_base.copy()
         
         # Draw Background Rain (Blurred)
-        layer_bg = Image.new('RGBA', (WIDTH, HEIGHT), (0,0,0,0))
+        layer_bg = Image.new('RGBA', (width, height), (0,0,0,0))
         draw_bg = ImageDraw.Draw(layer_bg)
         
         for drop in drops_bg:
-            draw_bg.line([drop[0], drop[1], drop[0], drop[1]+10], fill=(100, 120, 150, 100), width=1)
+            draw_bg.line([drop[0], drop[1], drop[0], drop[1]+10*s], fill=(100, 120, 150, 100), width=max(1, int(s)))
             drop[1] += drop[2] # Speed
-            if drop[1] > HEIGHT: drop[1] = -10; drop[0] = random.randint(0, WIDTH)
+            if drop[1] > height: drop[1] = -10*s; drop[0] = rng.randint(0, width)
             
         # Blur background rain for depth
-        layer_bg = layer_bg.filter(ImageFilter.GaussianBlur(2))
+        layer_bg = layer_bg.filter(ImageFilter.GaussianBlur(2 * s))
         frame.paste(layer_bg, (0,0), layer_bg)
         
         # Draw Foreground Rain (Sharp, Fast)
-        layer_fg = Image.new('RGBA', (WIDTH, HEIGHT), (0,0,0,0))
+        layer_fg = Image.new('RGBA', (width, height), (0,0,0,0))
         draw_fg = ImageDraw.Draw(layer_fg)
         
         for drop in drops_fg:
-            draw_fg.line([drop[0], drop[1], drop[0], drop[1]+25], fill=(200, 220, 255, 180), width=2)
+            draw_fg.line([drop[0], drop[1], drop[0], drop[1]+25*s], fill=(200, 220, 255, 180), width=int(2 * s))
             # Splash effect at bottom? 
             # keep it simple for GIF size
             drop[1] += drop[2]
-            if drop[1] > HEIGHT: drop[1] = -25; drop[0] = random.randint(0, WIDTH)
+            if drop[1] > height: drop[1] = -25*s; drop[0] = rng.randint(0, width)
 
         frame.paste(layer_fg, (0,0), layer_fg)
         
@@ -117,35 +132,37 @@ def create_cinematic_rainy():
         
         frames.append(frame)
 
-    frames[0].save('assets/backgrounds/rainy.gif', save_all=True, append_images=frames[1:], duration=50, loop=0)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50, loop=0)
 
-def create_cinematic_cloudy():
+def create_cinematic_cloudy(path, rng, width=WIDTH, height=HEIGHT):
     """Generates a soft, misty, cloudy scene with drifting fog."""
     frames = []
+    s = detail_scale(width, height)
+    margin = int(200 * s)
     # Muted Blue/Grey Gradient
-    bg_base = create_gradient(WIDTH, HEIGHT, (100, 110, 120), (180, 190, 200))
+    bg_base = create_gradient(width, height, (100, 110, 120), (180, 190, 200))
     
     # Generate "Clouds" as large blurred blobs
-    cloud_layer = Image.new('RGBA', (WIDTH + 200, HEIGHT), (0,0,0,0)) # Wider for scrolling
+    cloud_layer = Image.new('RGBA', (width + margin, height), (0,0,0,0)) # Wider for scrolling
     draw_cloud = ImageDraw.Draw(cloud_layer)
     
     # Draw randomness
-    for _ in range(50):
-        x = random.randint(0, WIDTH+200)
-        y = random.randint(0, HEIGHT//2)
-        r = random.randint(40, 100)
+    for _ in range(int(50 * width / WIDTH / s)):
+        x = rng.randint(0, width+margin)
+        y = rng.randint(0, height//2)
+        r = rng.randint(int(40 * s), int(100 * s))
         draw_cloud.ellipse([x-r, y-r, x+r, y+r], fill=(255, 255, 255, 30))
         
     # Heavily blur the clouds to define "mist"
-    cloud_layer = cloud_layer.filter(ImageFilter.GaussianBlur(30))
+    cloud_layer = cloud_layer.filter(ImageFilter.GaussianBlur(30 * s))
     
     for i in range(40):
         frame = bg_base.copy()
         
         # Scroll the cloud layer
-        offset = i * 1 # Slow drift
+        offset = int(i * s) # Slow drift
         # Crop the visible part
-        current_clouds = cloud_layer.crop((offset, 0, offset + WIDTH, HEIGHT))
+        current_clouds = cloud_layer.crop((offset, 0, offset + width, height))
         
         frame.paste(current_clouds, (0,0), current_clouds)
         
@@ -157,9 +174,9 @@ def create_cinematic_cloudy():
         
         frames.append(frame)
         
-    frames[0].save('assets/backgrounds/cloudy.gif', save_all=True, append_images=frames[1:], duration=100, loop=0)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
 
-def create_cinematic_default():
+def create_cinematic_default(path, rng, width=WIDTH, height=HEIGHT):
     """Deep twilight gradient with subtle color shift."""
     frames = []
     
@@ -169,22 +186,40 @@ def create_cinematic_default():
         top = (40 + int(shift), 20, 60) # Deep Purple/Red
         bot = (20, 20, 40) # Dark Blue
         
-        frame = create_gradient(WIDTH, HEIGHT, top, bot)
+        frame = create_gradient(width, height, top, bot)
         frames.append(frame)
 
-    frames[0].save('assets/backgrounds/default.gif', save_all=True, append_images=frames[1:], duration=150, loop=0)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=150, loop=0)
+
+# Scene name -> (generator, random seed). Seeding keeps rebuilds byte-identical.
+SCENES = {
+    "sunny": (create_cinematic_sunny, 1),
+    "rainy": (create_cinematic_rainy, 2),
+    "cloudy": (create_cinematic_cloudy, 3),
+    "default": (create_cinematic_default, 4),
+}
+
+def variant_path(name, width, height):
+    if (width, height) == (WIDTH, HEIGHT):
+        return f"assets/backgrounds/{name}.gif"
+    return f"assets/backgrounds/{name}_{width}x{height}.gif"
+
+def get_targets():
+    """Build targets for build_assets.py, keyed by scene source, size, seed and Pillow version."""
+    helpers = inspect.getsource(create_gradient) + inspect.getsource(detail_scale)
+    targets = []
+    for name, (generator, seed) in SCENES.items():
+        source = hashlib.sha256((helpers + inspect.getsource(generator)).encode()).hexdigest()
+        for width, height in VARIANTS:
+            targets.append({
+                "output": variant_path(name, width, height),
+                "params": {"generator": name, "source": source, "size": [width, height],
+                           "seed": seed, "pillow": PIL.__version__},
+                "build": lambda out, generator=generator, seed=seed, width=width, height=height:
+                    generator(out, random.Random(seed), width, height),
+            })
+    return targets
 
 if __name__ == "__main__":
-    print("Generating cinematic assets...")
-    try:
-        create_cinematic_sunny()
-        print("- Sunny Generated")
-        create_cinematic_rainy()
-        print("- Rainy Generated")
-        create_cinematic_cloudy()
-        print("- Cloudy Generated")
-        create_cinematic_default()
-        print("- Default Generated")
-        print("Done.")
-    except Exception as e:
-        print(f"Error: {e}")
+    import build_assets
+    build_assets.main(["--only", "backgrounds"] + sys.argv[1:])
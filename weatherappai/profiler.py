@@ -0,0 +1,190 @@
+import os
+import sys
+import time
+import threading
+import traceback
+import ctypes
+from collections import Counter
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+# Built-in profiler: python weather.py --profile
+# Samples every Python thread (the GUI thread running the Qt event loop, WeatherWorker threads,
+# dashboard fetch threads) and writes folded stacks, one "thread;frame;frame count" line per stack,
+# which flamegraph.pl, speedscope and inferno read directly. Counts are microseconds of CPU time.
+# GUI-thread stalls longer than PROFILE_STALL_MS are logged with the stack the GUI thread was stuck in.
+DEFAULT_OUTPUT = "weather-profile"
+HEARTBEAT_MS = 10
+THREAD_QUERY_LIMITED_INFORMATION = 0x0800
+
+
+class WindowsThreadClock:
+    """CPU seconds of one thread from GetThreadTimes (updated once per scheduler tick, about 15 ms)."""
+
+    def __init__(self, native_id):
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.handle = self.kernel32.OpenThread(THREAD_QUERY_LIMITED_INFORMATION, False, native_id)
+        if not self.handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+    def __call__(self):
+        # FILETIMEs in 100 ns units: creation, exit, kernel, user
+        times = [ctypes.c_ulonglong() for _ in range(4)]
+        if not self.kernel32.GetThreadTimes(self.handle, *[ctypes.byref(t) for t in times]):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return (times[2].value + times[3].value) / 10_000_000
+
+    def __del__(self):
+        if getattr(self, "handle", None):
+            self.kernel32.CloseHandle(self.handle)
+
+
+def thread_cpu_clock(ident, native_id=None):
+    # Per-thread CPU clock where the platform has one; None means wall-clock sampling
+    # (macOS, and on Windows QThreads, which have no threading.Thread and so no native id)
+    try:
+        if hasattr(time, "pthread_getcpuclockid"):
+            clock = time.pthread_getcpuclockid(ident)
+            return lambda: time.clock_gettime(clock)
+        if os.name == "nt" and native_id is not None:
+            return WindowsThreadClock(native_id)
+    except OSError:
+        pass
+    return None
+
+
+def frame_label(code):
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def stack_of(frame):
+    """Frame labels from the outermost call to the innermost."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class Profiler(QObject):
+    """Sampling profiler plus a GUI-thread stall watchdog, enabled with --profile."""
+
+    def __init__(self, app, output=None):
+        super().__init__()
+        self.output = output or os.getenv("PROFILE_OUTPUT", DEFAULT_OUTPUT)
+        self.interval = max(1, int(os.getenv("PROFILE_INTERVAL_MS", "5"))) / 1000
+        self.stall_threshold = max(HEARTBEAT_MS * 2, int(os.getenv("PROFILE_STALL_MS", "100"))) / 1000
+        self.gui_ident = threading.main_thread().ident
+
+        self.stacks = Counter() # "thread;frame;frame" -> microseconds
+        self.samples = 0
+        self.stalls = 0
+        self.clocks = {} # thread ident -> (cpu clock id or None, last reading)
+        self.stall_stack = None
+        self.stall_log = open(self.output + "-stalls.txt", "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        # The heartbeat only fires when the event loop is free, so a late beat is a stall
+        self.last_beat = time.monotonic()
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setTimerType(Qt.PreciseTimer)
+        self.heartbeat.timeout.connect(self.beat)
+        self.heartbeat.start(HEARTBEAT_MS)
+
+        self.sampler = threading.Thread(target=self.run, name="profiler", daemon=True)
+        self.sampler.start()
+        app.aboutToQuit.connect(self.stop)
+
+    def thread_label(self, ident, frame, names):
+        if ident == self.gui_ident:
+            return "GUI thread"
+        if ident in names:
+            return names[ident]
+        # QThreads are not threading.Thread objects; name them after the class whose run() they execute
+        while frame.f_back is not None:
+            frame = frame.f_back
+        return getattr(frame.f_code, "co_qualname", frame.f_code.co_name).split(".")[0]
+
+    def cpu_spent(self, ident, now, native_id=None):
+        """Seconds this thread ran since the last sample (wall time where CPU clocks are missing)."""
+        clock, last = self.clocks.get(ident, (None, None))
+        if last is None:
+            clock = thread_cpu_clock(ident, native_id)
+        try:
+            reading = clock() if clock is not None else now
+        except OSError:
+            # Thread exited between the snapshot and the read
+            self.clocks.pop(ident, None)
+            return 0.0
+        self.clocks[ident] = (clock, reading)
+        return 0.0 if last is None else reading - last
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            frames = sys._current_frames()
+            threads = threading.enumerate()
+            names = {t.ident: t.name for t in threads}
+            native_ids = {t.ident: t.native_id for t in threads}
+            with self._lock:
+                for ident, frame in frames.items():
+                    if ident == own:
+                        continue
+                    spent = self.cpu_spent(ident, now, native_ids.get(ident))
+                    if spent <= 0:
+                        continue
+                    stack = stack_of(frame)
+                    if ident == self.gui_ident and len(stack) == 1:
+                        # Without a CPU clock an idle loop looks the same as a busy one; only a late
+                        # heartbeat shows that Qt was actually working
+                        if self.clocks[ident][0] is None and now - self.last_beat < 2 * HEARTBEAT_MS / 1000:
+                            continue
+                        # Only the app.exec_() line is Python: Qt itself is busy (GIF decoding, painting, layout)
+                        stack.append("[Qt event loop]")
+                    label = self.thread_label(ident, frame, names)
+                    self.stacks[";".join([label] + stack)] += int(spent * 1_000_000)
+                    self.samples += 1
+                for ident in set(self.clocks) - set(frames):
+                    del self.clocks[ident]
+
+                # Grab the GUI stack while it is stuck, the heartbeat logs it once the loop is back
+                if self.stall_stack is None and now - self.last_beat > self.stall_threshold:
+                    gui_frame = frames.get(self.gui_ident)
+                    self.stall_stack = traceback.format_stack(gui_frame) if gui_frame else []
+
+    def beat(self):
+        now = time.monotonic()
+        late = now - self.last_beat - HEARTBEAT_MS / 1000
+        self.last_beat = now
+        with self._lock:
+            stack, self.stall_stack = self.stall_stack, None
+        if late < self.stall_threshold:
+            return
+        self.stalls += 1
+        message = f"GUI thread stalled for {late * 1000:.0f} ms"
+        print(f"[profile] {message}", file=sys.stderr)
+        self.stall_log.write(f"{time.strftime('%H:%M:%S')} {message}\n")
+        if stack:
+            self.stall_log.write("".join(stack))
+        else:
+            self.stall_log.write("  (stack not captured, the stall ended before the next sample)\n")
+        self.stall_log.write("\n")
+        self.stall_log.flush()
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self.sampler.join()
+        self.heartbeat.stop()
+        self.stall_log.close()
+        with open(self.output + ".folded", "w", encoding="utf-8") as f:
+            for stack, micros in self.stacks.most_common():
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+        print(f"[profile] {self.samples} samples -> {self.output}.folded, "
+              f"{self.stalls} stalls over {self.stall_threshold * 1000:.0f} ms -> {self.output}-stalls.txt",
+              file=sys.stderr)
@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Token bucket shared by every process using the same API key (GUI, dashboard, bulk export...).
+# State lives in a small JSON file guarded by a lock file, so separate processes see one quota.
+# Usage: python quota.py   -> shows the remaining quota for API_KEY
+DEFAULT_QUOTA_FILE = os.path.join(os.path.expanduser("~"), ".weatherapp_quota.json")
+
+
+class QuotaExceeded(Exception):
+    """No API call could be made within the allowed wait."""
+
+
+def quota_file():
+    return os.getenv("QUOTA_FILE", DEFAULT_QUOTA_FILE)
+
+
+def rate_per_minute():
+    # OpenWeather's free plan allows 60 calls per minute
+    return max(1.0, float(os.getenv("API_RATE_PER_MINUTE", "60")))
+
+
+def burst():
+    return max(1.0, float(os.getenv("API_BURST", str(rate_per_minute()))))
+
+
+def key_id(api_key):
+    # Never store the key itself
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+
+
+class _FileLock:
+    def __init__(self, path, shared=False):
+        self.path = path
+        self.shared = shared # readers only; msvcrt has no shared mode, so Windows always locks exclusively
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "a+b")
+        if os.name == "nt":
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if os.name == "nt":
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+
+
+_thread_lock = threading.Lock()
+_warned = False
+REPLACE_RETRIES = 10 # attempts, 20 ms apart, while another program (virus scanner, indexer) holds the file
+
+
+def _warn_unavailable(error):
+    # Rate limiting is a courtesy to the API; a broken quota file must not stop fetching
+    global _warned
+    if not _warned:
+        _warned = True
+        print(f"API quota file unavailable ({error}), calls are not rate limited", file=sys.stderr)
+
+
+def _new_entry(now):
+    return {"tokens": burst(), "updated": now, "total": 0,
+            "minute": [int(now // 60), 0], "day": [time.strftime("%Y-%m-%d"), 0]}
+
+
+def _refresh(entry, now):
+    # Refill for the time since the last update and roll the counters over
+    entry["tokens"] = min(burst(), entry["tokens"] + (now - entry["updated"]) * rate_per_minute() / 60)
+    entry["updated"] = now
+    if entry["minute"][0] != int(now // 60):
+        entry["minute"] = [int(now // 60), 0]
+    if entry["day"][0] != time.strftime("%Y-%m-%d"):
+        entry["day"] = [time.strftime("%Y-%m-%d"), 0]
+
+
+def _read_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _update(api_key, change):
+    """Runs change(entry, now) on this key's state under the cross-process lock and saves it."""
+    path = quota_file()
+    with _thread_lock, _FileLock(path + ".lock"):
+        state = _read_state(path)
+        now = time.time()
+        entry = state.setdefault(key_id(api_key), _new_entry(now))
+        _refresh(entry, now)
+
+        result = change(entry, now)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            _replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return result
+
+
+def _replace(tmp_path, path):
+    # On Windows the replace fails while any other handle has the file open
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(0.02)
+
+
+def _token_wait(entry):
+    # Seconds until the next token is available
+    return (1 - entry["tokens"]) * 60 / rate_per_minute()
+
+
+def _take_ticket(entry, now):
+    # Tickets are handed out in arrival order across every process sharing the file
+    ticket = entry.get("next_ticket", 0)
+    entry["next_ticket"] = ticket + 1
+    return ticket
+
+
+def _serve(ticket):
+    def serve(entry, now):
+        interval = 60 / rate_per_minute()
+        # Waiters check in at least once per token interval, so silence means they gave up or died
+        waiters = {t: seen for t, seen in entry.get("waiters", {}).items() if now - seen <= max(2.0, 3 * interval)}
+        waiters[str(ticket)] = now
+        entry["waiters"] = waiters
+        ahead = sum(1 for t in waiters if int(t) < ticket)
+        if ahead:
+            # Check back about when the callers ahead of us can have been served
+            return max(0.05, min(interval, (ahead - entry["tokens"]) * interval))
+        if entry["tokens"] < 1:
+            return min(interval, _token_wait(entry))
+        entry["tokens"] -= 1
+        entry["total"] += 1
+        entry["minute"][1] += 1
+        entry["day"][1] += 1
+        del waiters[str(ticket)]
+        return 0.0
+    return serve
+
+
+def acquire(api_key, max_wait=30):
+    """Takes one call from the shared quota, waiting up to max_wait seconds (None: no limit) for it.
+
+    Waiting callers are served in arrival order, across threads and processes. If the quota file
+    cannot be used the call is allowed, with a warning."""
+    deadline = None if max_wait is None else time.monotonic() + max_wait
+    try:
+        ticket = _update(api_key, _take_ticket)
+        while True:
+            wait = _update(api_key, _serve(ticket))
+            if wait == 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                # Our place in the queue lapses once we stop checking in
+                raise QuotaExceeded(f"No API quota left for {max_wait}s")
+            time.sleep(wait)
+    except OSError as e:
+        _warn_unavailable(e)
+
+
+def drain(api_key):
+    """Empties the bucket after the server answered 429, so every process backs off."""
+    def empty(entry, now):
+        entry["tokens"] = min(entry["tokens"], 0)
+    try:
+        _update(api_key, empty)
+    except OSError as e:
+        _warn_unavailable(e)
+
+
+def status(api_key):
+    """Current quota for a key. Reads under a shared lock so it never holds the file open while it is replaced."""
+    path = quota_file()
+    with _FileLock(path + ".lock", shared=True):
+        state = _read_state(path)
+    now = time.time()
+    entry = state.get(key_id(api_key)) or _new_entry(now)
+    _refresh(entry, now)
+    return {"remaining": int(entry["tokens"]), "rate_per_minute": rate_per_minute(),
+            "used_this_minute": entry["minute"][1], "used_today": entry["day"][1],
+            "used_total": entry["total"]}
+
+
+def describe(api_key):
+    try:
+        info = status(api_key)
+    except OSError as e:
+        return f"API quota: unavailable ({e.strerror or e})"
+    return (f"API quota: {info['remaining']} of {info['rate_per_minute']:.0f} calls left this minute "
+            f"({info['used_today']} used today)")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    api_key = os.getenv("API_KEY")
+    if not api_key:
+        print("API Key Missing")
+        sys.exit(1)
+    print(describe(api_key))
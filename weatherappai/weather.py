@@ -1,5 +1,4 @@
 import sys
-import requests
 import os
 import datetime # For greeting
 from dotenv import load_dotenv
@@ -9,12 +8,18 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QLineEdit,
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QRect, QSize
 from PyQt5.QtGui import QColor, QMovie, QPixmap, QPalette, QBrush
 from PyQt5.QtGui import QIcon
+from animation import AnimationController
+from card import Card, CardShadow
+from background import BackgroundView, pick_background_variant
+import quota
+from weather_api import fetch_weather, fetch_weather_by_coords, parse_coordinates, WeatherError, stats
 
 load_dotenv()
 
 class WeatherWorker(QThread):
-    finished = pyqtSignal(dict)
-    error = pyqtSignal(str)
+    # The second argument is the quota/network summary, read here rather than on the GUI thread
+    finished = pyqtSignal(dict, str)
+    error = pyqtSignal(str, str)
 
     def __init__(self, city, api_key):
         super().__init__()
@@ -22,36 +27,21 @@ class WeatherWorker(QThread):
         self.api_key = api_key
 
     def run(self):
-        url = f"https://api.openweathermap.org/data/2.5/weather?q={self.city}&appid={self.api_key}"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            if data['cod'] == 200:
-                self.finished.emit(data)
+            # "lat, lon" input is resolved to the nearest known city
+            coordinates = parse_coordinates(self.city)
+            if coordinates:
+                data = fetch_weather_by_coords(*coordinates, self.api_key)
             else:
-                self.error.emit(data.get("message", "Unknown Error"))
-        except requests.exceptions.HTTPError:
-            match response.status_code:
-                case 400: self.error.emit("Bad request\nPlease Check Your Input")
-                case 401: self.error.emit("Unauthorized\nCheck Your API Key")
-                case 403: self.error.emit("Forbidden\nCheck Your API Key")
-                case 404: self.error.emit("Not Found\nCity Not Found")
-                case 500: self.error.emit("Internal Server Error\nTry Again Later")
-                case 502: self.error.emit("Bad Gateway\nTry Again Later")
-                case 503: self.error.emit("Service Unavailable\nTry Again Later")
-                case 504: self.error.emit("Gateway Timeout\nTry Again Later")
-                case _: self.error.emit("Unknown Error")
-        except requests.exceptions.ConnectionError:
-            self.error.emit("Connection Error\nCheck Your Internet Connection")
-        except requests.exceptions.Timeout:
-            self.error.emit("Timeout Error\nTry Again Later")
-        except requests.exceptions.RequestException:
-            self.error.emit("An Error Occurred\nPlease Try Again")
-        except requests.exceptions.TooManyRedirects:
-            self.error.emit("Too Many Redirects\nPlease Try Again Later")
+                data = fetch_weather(self.city, self.api_key)
+            self.finished.emit(data, self.usage())
+        except WeatherError as e:
+            self.error.emit(str(e), self.usage())
         except Exception as e:
-            self.error.emit(f"An unexpected error occurred: {e}")
+            self.error.emit(f"An unexpected error occurred: {e}", self.usage())
+
+    def usage(self):
+        return quota.describe(self.api_key) + "\n" + stats.describe()
 
 class WeatherApp(QWidget):
     def __init__(self):
@@ -63,10 +53,13 @@ class WeatherApp(QWidget):
         self.setGeometry(100, 100, 450, 650)
 
         # Background Animation Label
-        self.background_label = QLabel(self)
+        self.background_label = BackgroundView(self)
         self.background_label.setGeometry(0, 0, 450, 650)
-        self.background_label.setScaledContents(True)
         self.current_movie = None
+        self.background_path = None
+
+        # Pauses/throttles movies while the window is hidden, inactive or idle
+        self.animations = AnimationController(self)
         
         # Set default background
         self.set_background_movie("assets/backgrounds/default.gif")
@@ -77,7 +70,7 @@ class WeatherApp(QWidget):
         self.setLayout(main_layout)
 
         # Weather Card
-        self.card = QFrame()
+        self.card = Card()
         self.card.setObjectName("Card")
         self.card.setFixedSize(400, 600)
         
@@ -86,14 +79,6 @@ class WeatherApp(QWidget):
         card_layout.setSpacing(15)
         card_layout.setContentsMargins(25, 25, 25, 25)
 
-        # Drop Shadow for Card
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(30)
-        shadow.setXOffset(0)
-        shadow.setYOffset(10)
-        shadow.setColor(QColor(0, 0, 0, 80))
-        self.card.setGraphicsEffect(shadow)
-
         # Greeting
         self.greeting_label = QLabel(self.get_greeting())
         self.greeting_label.setObjectName("Greeting")
@@ -107,7 +92,7 @@ class WeatherApp(QWidget):
         # Input Field & Button Layout
         input_layout = QHBoxLayout()
         self.city_input = QLineEdit()
-        self.city_input.setPlaceholderText("Enter City Name")
+        self.city_input.setPlaceholderText("City Name or lat, lon")
         
         self.get_weather_button = QPushButton("Check Weather 🌦")
         self.get_weather_button.setCursor(Qt.PointingHandCursor)
@@ -208,6 +193,9 @@ class WeatherApp(QWidget):
 
         main_layout.addWidget(self.card)
 
+        # Drop Shadow for Card (pre-blurred once, drawn as a sibling underneath)
+        self.card_shadow = CardShadow(self.card, self)
+
         # Styling
         self.apply_styles()
 
@@ -223,16 +211,28 @@ class WeatherApp(QWidget):
         self.background_label.setGeometry(0, 0, self.width(), self.height())
         super().resizeEvent(event)
 
+        # Switch to a better matching size variant if the window outgrew the current one
+        if self.background_path and self.current_movie:
+            size = self.background_label.device_size()
+            variant = pick_background_variant(self.background_path, size.width(), size.height())
+            if variant != self.current_movie.fileName():
+                self.set_background_movie(self.background_path)
+
     def set_background_movie(self, gif_path):
         if not os.path.exists(gif_path):
             return
         
         if self.current_movie:
-            self.current_movie.stop()
+            self.animations.stop_movie(self.current_movie)
+
+        # Use the generated size variant closest to the window's size in device pixels
+        self.background_path = gif_path
+        size = self.background_label.device_size()
+        variant = pick_background_variant(gif_path, size.width(), size.height())
             
-        self.current_movie = QMovie(gif_path)
-        self.background_label.setMovie(self.current_movie)
-        self.current_movie.start()
+        self.current_movie = QMovie(variant)
+        self.background_label.set_movie(self.current_movie)
+        self.animations.start_movie(self.current_movie)
         self.background_label.lower() # Ensure it stays behind everything inside the Window but wait..
         # Since self.card is added to main_layout which is on self (WeatherApp), 
         # and background_label is children of self.
@@ -254,11 +254,6 @@ class WeatherApp(QWidget):
             QWidget {
                 font-family: 'Segoe UI', sans-serif;
             }
-            QFrame#Card {
-                background-color: rgba(20, 20, 30, 0.75); 
-                border-radius: 25px;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-            }
             QLabel#Greeting {
                 font-size: 24px;
                 font-weight: 600;
@@ -346,7 +341,7 @@ class WeatherApp(QWidget):
         # UI State: Loading
         self.weather_container.hide()
         self.loading_label.setVisible(True)
-        self.loading_movie.start()
+        self.animations.start_movie(self.loading_movie)
         self.get_weather_button.setEnabled(False)
         self.city_input.setEnabled(False)
         
@@ -359,16 +354,18 @@ class WeatherApp(QWidget):
         self.worker.error.connect(self.handle_error)
         self.worker.start()
 
-    def handle_response(self, data):
+    def handle_response(self, data, usage):
         self.stop_loading()
         self.display_weather(data)
+        self.get_weather_button.setToolTip(usage)
 
-    def handle_error(self, message):
+    def handle_error(self, message, usage):
         self.stop_loading()
         self.display_error(message)
+        self.get_weather_button.setToolTip(usage)
 
     def stop_loading(self):
-        self.loading_movie.stop()
+        self.animations.stop_movie(self.loading_movie)
         self.loading_label.setVisible(False)
         self.get_weather_button.setEnabled(True)
         self.city_input.setEnabled(True)
@@ -448,7 +445,8 @@ class WeatherApp(QWidget):
         self.set_background_movie(bg_file)
         self.message_label.setText(message)
 
-    def get_weather_icon_path(self, weather_id):
+    @staticmethod
+    def get_weather_icon_path(weather_id):
         # Using the assets generated by generate_assets.py
         if 200 <= weather_id <= 232: return "assets/icons/thunder.png"
         if 300 <= weather_id <= 321: return "assets/icons/rain.png" # Drizzle
@@ -462,6 +460,10 @@ class WeatherApp(QWidget):
     def fade_in_animation(self):
         from PyQt5.QtWidgets import QGraphicsOpacityEffect
         
+        # Stop a fade that is still running so it can't drop the new effect when it ends
+        if getattr(self, "anim", None) is not None:
+            self.anim.stop()
+
         # Check if effect already exists to avoid piling up
         effect = self.weather_container.graphicsEffect()
         if not effect:
@@ -473,11 +475,24 @@ class WeatherApp(QWidget):
         self.anim.setStartValue(0)
         self.anim.setEndValue(1)
         self.anim.setEasingCurve(QEasingCurve.OutQuad)
+        # The effect re-renders the whole container offscreen, so drop it once fully opaque
+        self.anim.finished.connect(lambda: self.weather_container.setGraphicsEffect(None))
         self.anim.start()
+        self.animations.track_animation(self.anim)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    weather_app = WeatherApp()
+    if '--profile' in sys.argv:
+        # CPU samples and GUI stalls: python weather.py --profile (see profiler.py)
+        from profiler import Profiler
+        profiler = Profiler(app)
+    if '--dashboard' in sys.argv:
+        # Multi-city mode: python weather.py --dashboard [watchlist.txt]
+        from dashboard import DashboardWindow, load_watchlist
+        args = [arg for arg in sys.argv[sys.argv.index('--dashboard') + 1:] if not arg.startswith('--')]
+        watchlist = args[0] if args else os.getenv("WATCHLIST", "watchlist.txt")
+        weather_app = DashboardWindow(load_watchlist(watchlist), os.getenv("API_KEY"), WeatherApp.get_weather_icon_path)
+    else:
+        weather_app = WeatherApp()
     weather_app.show()
     sys.exit(app.exec_())
- 
\ No newline at end of file
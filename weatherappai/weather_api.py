@@ -0,0 +1,235 @@
+import os
+import re
+import time
+import threading
+import requests
+from collections import OrderedDict
+from urllib3.util.request import ACCEPT_ENCODING
+import city_index
+import quota
+
+# Shared by the GUI worker and the command-line tools
+DEFAULT_API_URL = "https://api.openweathermap.org/data/2.5/weather"
+REQUEST_TIMEOUT = 10 # seconds
+CACHE_TTL = 600 # OpenWeather refreshes observations about every 10 minutes
+RECHECK_MIN = 60 # seconds before asking again when the next observation is late; doubled up to CACHE_TTL
+CACHE_SIZE = 1000 # cities
+QUOTA_MAX_WAIT = 30 # seconds to wait for a free API call before giving up
+SNAP_DISTANCE_KM = 30 # coordinates farther than this from any known city are queried as-is
+
+COORDINATES_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+class WeatherError(Exception):
+    """A failed fetch, carrying the message the app shows to the user."""
+
+
+class RateLimited(WeatherError):
+    """The shared quota or the server turned the call away for now; the same call can succeed later."""
+
+
+def error_message(status_code):
+    match status_code:
+        case 400: return "Bad request\nPlease Check Your Input"
+        case 401: return "Unauthorized\nCheck Your API Key"
+        case 403: return "Forbidden\nCheck Your API Key"
+        case 404: return "Not Found\nCity Not Found"
+        case 429: return "Too Many Requests\nTry Again Later"
+        case 500: return "Internal Server Error\nTry Again Later"
+        case 502: return "Bad Gateway\nTry Again Later"
+        case 503: return "Service Unavailable\nTry Again Later"
+        case 504: return "Gateway Timeout\nTry Again Later"
+        case _: return "Unknown Error"
+
+
+def api_url():
+    # Read on every call so a .env loaded after import still applies (e.g. a local stub server)
+    return os.getenv("API_BASE_URL", DEFAULT_API_URL)
+
+
+class FetchStats:
+    """Network counters for every fetch made through this module."""
+
+    def __init__(self):
+        self.requests = 0 # sent to the API
+        self.not_modified = 0 # answered 304, the cached body was reused
+        self.avoided = 0 # not sent, the cached observation was still current
+        self.bytes_received = 0 # response bodies as transferred (compressed)
+        self.bytes_decoded = 0 # response bodies after decompression
+        self.lock = threading.Lock()
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def describe(self):
+        with self.lock:
+            return (f"Network: {self.requests} requests ({self.not_modified} not modified), "
+                    f"{self.avoided} avoided, {self.bytes_received / 1024:.1f} KB received "
+                    f"({self.bytes_decoded / 1024:.1f} KB uncompressed)")
+
+
+stats = FetchStats()
+
+
+class CacheEntry:
+    def __init__(self, data, etag=None, last_modified=None, checked_at=None, recheck=RECHECK_MIN):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked_at = time.time() if checked_at is None else checked_at
+        self.recheck = recheck # seconds after checked_at before asking again
+
+    def is_current(self, ttl, now=None):
+        """True until the next observation is due: ttl after the observation's dt, but never sooner than
+        recheck after the last check, so a station that stopped updating is asked less and less often.
+
+        The wait is capped at ttl after the check in case the local clock is behind the server's."""
+        now = time.time() if now is None else now
+        due = max(self.data.get("dt", self.checked_at) + ttl, self.checked_at + self.recheck)
+        return now < min(due, self.checked_at + ttl)
+
+
+class WeatherCache:
+    """Recent observations keyed by OpenWeather city id, shared by name, id and coordinate queries.
+
+    Entries outlive their freshness so they can be revalidated with a conditional request."""
+
+    def __init__(self, ttl=CACHE_TTL, size=CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries = OrderedDict() # city id -> CacheEntry
+        self.names = OrderedDict() # normalized city name -> city id
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize(name):
+        return " ".join(name.lower().split())
+
+    def lookup(self, city_id):
+        with self.lock:
+            entry = self.entries.get(city_id)
+            if entry is not None:
+                self.entries.move_to_end(city_id)
+            return entry
+
+    def lookup_name(self, name):
+        with self.lock:
+            city_id = self.names.get(self.normalize(name))
+        return None if city_id is None else self.lookup(city_id)
+
+    def put(self, data, name=None, etag=None, last_modified=None, now=None, recheck=RECHECK_MIN):
+        city_id = data.get("id")
+        if not city_id:
+            return
+        with self.lock:
+            self.entries[city_id] = CacheEntry(data, etag, last_modified, checked_at=now, recheck=recheck)
+            self.entries.move_to_end(city_id)
+            if name:
+                self.names[self.normalize(name)] = city_id
+                self.names.move_to_end(self.normalize(name))
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+            while len(self.names) > self.size:
+                self.names.popitem(last=False)
+
+
+cache = WeatherCache()
+
+
+def parse_coordinates(text):
+    """Returns (lat, lon) for input like "51.5, -0.12", or None for a city name."""
+    match = COORDINATES_PATTERN.match(text)
+    if not match:
+        return None
+    lat, lon = float(match.group(1)), float(match.group(2))
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+def request_weather(params, api_key, session=None, timeout=REQUEST_TIMEOUT, cached=None, quota_wait=QUOTA_MAX_WAIT):
+    """Performs one API request and returns (data, etag, last_modified). Raises WeatherError on failure.
+
+    With a cached entry the request is conditional and its data is reused on 304 Not Modified."""
+    http = session or requests
+    headers = {"Accept-Encoding": ACCEPT_ENCODING}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    try:
+        # Every call goes through the quota shared with other processes using this key
+        quota.acquire(api_key, max_wait=quota_wait)
+    except quota.QuotaExceeded:
+        raise RateLimited("Rate Limit Reached\nTry Again Later")
+    try:
+        response = http.get(api_url(), params={**params, "appid": api_key}, headers=headers, timeout=timeout)
+        # raw.tell() counts the bytes read off the wire, before decompression
+        stats.add(requests=1, bytes_received=response.raw.tell() if response.raw else 0,
+                  bytes_decoded=len(response.content))
+        if response.status_code == 304 and cached is not None:
+            stats.add(not_modified=1)
+            return (cached.data, response.headers.get("ETag", cached.etag),
+                    response.headers.get("Last-Modified", cached.last_modified))
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.HTTPError:
+        if response.status_code == 429:
+            quota.drain(api_key)
+            raise RateLimited(error_message(response.status_code))
+        raise WeatherError(error_message(response.status_code))
+    except requests.exceptions.ConnectionError:
+        raise WeatherError("Connection Error\nCheck Your Internet Connection")
+    except requests.exceptions.Timeout:
+        raise WeatherError("Timeout Error\nTry Again Later")
+    except requests.exceptions.TooManyRedirects:
+        raise WeatherError("Too Many Redirects\nPlease Try Again Later")
+    except requests.exceptions.RequestException:
+        raise WeatherError("An Error Occurred\nPlease Try Again")
+
+    if data['cod'] == 200:
+        return data, response.headers.get("ETag"), response.headers.get("Last-Modified")
+    raise WeatherError(data.get("message", "Unknown Error"))
+
+
+def fetch_cached(entry, params, api_key, session=None, timeout=REQUEST_TIMEOUT, name=None, now=None,
+                 quota_wait=QUOTA_MAX_WAIT):
+    """Returns the cached observation while it is current, otherwise revalidates or refetches it."""
+    if entry is not None and entry.is_current(cache.ttl, now):
+        stats.add(avoided=1)
+        return entry.data
+    data, etag, last_modified = request_weather(params, api_key, session, timeout, cached=entry, quota_wait=quota_wait)
+    # No newer observation yet (304, or a server ignoring validators): back off before asking again
+    if entry is not None and data.get("dt") == entry.data.get("dt"):
+        recheck = min(cache.ttl, entry.recheck * 2)
+    else:
+        recheck = RECHECK_MIN
+    cache.put(data, name=name, etag=etag, last_modified=last_modified, now=now, recheck=recheck)
+    return data
+
+
+def fetch_weather(city, api_key, session=None, timeout=REQUEST_TIMEOUT, quota_wait=QUOTA_MAX_WAIT):
+    """Fetches current weather for a city name. Raises WeatherError on failure.
+
+    quota_wait=None waits for the shared quota however long it takes."""
+    return fetch_cached(cache.lookup_name(city), {"q": city}, api_key, session, timeout, name=city,
+                        quota_wait=quota_wait)
+
+
+def fetch_weather_by_id(city_id, api_key, session=None, timeout=REQUEST_TIMEOUT):
+    return fetch_cached(cache.lookup(city_id), {"id": city_id}, api_key, session, timeout)
+
+
+def fetch_weather_by_coords(lat, lon, api_key, session=None, timeout=REQUEST_TIMEOUT):
+    """Fetches weather for the nearest known city, so nearby coordinates share one cache entry."""
+    index = city_index.default_index()
+    match = index.nearest(lat, lon) if index else None
+    if match and match[1] <= SNAP_DISTANCE_KM:
+        return fetch_weather_by_id(match[0][0], api_key, session, timeout)
+    # No city list installed, or nowhere near a known city
+    data, etag, last_modified = request_weather({"lat": lat, "lon": lon}, api_key, session, timeout)
+    cache.put(data, etag=etag, last_modified=last_modified)
+    return data